@@ -0,0 +1,202 @@
+"""
+Created by: Randy Grizzelli
+Email: grizzellir@gmail.com
+GitHub: https://github.com/rsgrizz
+Version: 0.1
+Date: 2026-02-21
+Purpose: Communication Heuristics Analysis for Triage (CHAT) engine for deterministic prioritization of exported communications.
+"""
+
+# Per row hot path helpers shared by ingest and normalize.
+#
+# Everything here is kept fully typed and free of package imports so the
+# module is a candidate for mypyc. Check the typing with
+#
+#     mypy --strict chat_engine/core/_fast.py
+#
+# which must stay clean before building with
+#
+#     mypyc chat_engine/core/_fast.py
+#
+# The built extension module shadows this file on import. Without it the
+# pure Python module is used and behavior is identical. ingest and normalize
+# re-export these helpers under their original private names.
+
+from __future__ import annotations
+
+import re
+import sys
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from zoneinfo import ZoneInfo
+
+_UTC = timezone.utc
+
+# Shapes of the non ISO export timestamps CHAT accepts. Matching the shape
+# once and building the datetime from the captured fields replaces probing
+# a list of strptime formats, each miss of which raises ValueError.
+#   %Y-%m-%d %H:%M[:%S]      %Y-%m-%dT%H:%M:%S[.%f]
+#   %m/%d/%Y %H:%M[:%S]      %m/%d/%y %H:%M[:%S]
+# As with strptime %d, a single digit day may be space padded.
+_DASH_SHAPE_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2}| \d)"
+    r"(?:\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?"
+    r"|T(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.(\d{1,6}))?)",
+    # strptime matched formats case insensitively, so a lowercase t is accepted too
+    re.IGNORECASE,
+)
+_SLASH_SHAPE_RE = re.compile(
+    r"(\d{1,2})/(\d{1,2}| \d)/(\d{4}|\d{2})\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?"
+)
+
+_INTERN_MAX_LEN = 64
+
+
+def safe_str(v: object) -> str:
+    if v is None:
+        return ""
+    return str(v).strip()
+
+
+def dedupe_headers(headers: List[str]) -> List[str]:
+    """
+    If an export has duplicate column names, suffix them deterministically.
+    Example: Message, Message becomes Message, Message_2
+    """
+    seen: Dict[str, int] = {}
+    out: List[str] = []
+    for h in headers:
+        base = h if h else "COL"
+        count = seen.get(base, 0) + 1
+        seen[base] = count
+        out.append(base if count == 1 else f"{base}_{count}")
+    return out
+
+
+def timestamp_to_utc_iso(s: str, assume_tz: str) -> Optional[str]:
+    """
+    Uncached core of parse_timestamp_to_utc_iso. s must already be stripped
+    and non empty.
+    """
+    dt = _fast_ymd_hms(s)
+    # Every ISO 8601 form fromisoformat accepts starts with a 4 digit year,
+    # so slash dated and other non ISO strings skip the raise and catch
+    if dt is None and s[:4].isdigit():
+        dt = _try_fromiso(s)
+    if dt is None:
+        dt = _parse_by_shape(s)
+
+    if dt is None:
+        return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=_zoneinfo(assume_tz))
+
+    dt_utc = dt.astimezone(_UTC)
+    return dt_utc.isoformat().replace("+00:00", "Z")
+
+
+@lru_cache(maxsize=64)
+def _zoneinfo(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def clean_party(s: str) -> str:
+    # s is already stripped at ingest, so only internal whitespace is collapsed
+    # Every whitespace character except a plain space is unprintable, so this
+    # catches all input split and join would change, at substring check cost
+    if "  " in s or not s.isprintable():
+        s = " ".join(s.split())
+    return intern_short(s)
+
+
+def intern_short(s: str) -> str:
+    """
+    Interns short values of columns that repeat heavily across rows, such as
+    senders, recipients and thread ids, so rows share one string object.
+    Only call this for such columns: on Python 3.12+ interned strings are
+    never freed.
+    """
+    return sys.intern(s) if len(s) < _INTERN_MAX_LEN else s
+
+
+def stable_key(ts_raw: str, sender: str, recipient: str) -> str:
+    """
+    Deterministic 32 bit key using CRC32 computed in C by zlib.
+    """
+    base = f"{ts_raw}|{sender}|{recipient}"
+    return str(zlib.crc32(base.encode("utf-8", errors="replace")) & 0xFFFFFFFF)
+
+
+def _fast_ymd_hms(s: str) -> Optional[datetime]:
+    """
+    Fixed offset parse of YYYY-MM-DD HH:MM:SS, the dominant export shape.
+    Returns None for anything else so the general paths can handle it.
+    """
+    if (
+        len(s) != 19
+        or s[4] != "-"
+        or s[7] != "-"
+        or s[10] != " "
+        or s[13] != ":"
+        or s[16] != ":"
+        or not s.isascii()
+    ):
+        return None
+
+    y, mo, d, h, mi, sec = s[0:4], s[5:7], s[8:10], s[11:13], s[14:16], s[17:19]
+    if not (y + mo + d + h + mi + sec).isdigit():
+        return None
+    return _build_datetime(int(y), int(mo), int(d), int(h), int(mi), int(sec), 0)
+
+
+def _try_fromiso(s: str) -> Optional[datetime]:
+    try:
+        if s.endswith("Z"):
+            dt = datetime.fromisoformat(s[:-1])
+            # An explicit offset followed by Z is malformed
+            if dt.tzinfo is not None:
+                return None
+            return dt.replace(tzinfo=_UTC)
+        return datetime.fromisoformat(s)
+    except Exception:
+        return None
+
+
+def _parse_by_shape(s: str) -> Optional[datetime]:
+    m = _DASH_SHAPE_RE.fullmatch(s)
+    if m is not None:
+        y, mo, d, h, mi, sec, th, tmi, tsec, frac = m.groups()
+        if h is None:
+            h, mi, sec = th, tmi, tsec
+        micro = int(frac.ljust(6, "0")) if frac else 0
+        return _build_datetime(int(y), int(mo), int(d), int(h), int(mi), int(sec or 0), micro)
+
+    m = _SLASH_SHAPE_RE.fullmatch(s)
+    if m is not None:
+        mo, d, y, h, mi, sec = m.groups()
+        year = int(y)
+        if len(y) == 2:
+            # Same pivot as strptime %y: 69 to 99 is 1900s, 00 to 68 is 2000s
+            year += 1900 if year >= 69 else 2000
+        return _build_datetime(year, int(mo), int(d), int(h), int(mi), int(sec or 0), 0)
+
+    return None
+
+
+def _build_datetime(
+    year: int,
+    month: int,
+    day: int,
+    hour: int,
+    minute: int,
+    second: int,
+    microsecond: int,
+) -> Optional[datetime]:
+    try:
+        return datetime(year, month, day, hour, minute, second, microsecond)
+    except ValueError:
+        return None
@@ -10,37 +10,45 @@ Purpose: Communication Heuristics Analysis for Triage (CHAT) engine for determin
 from __future__ import annotations
 
 import csv
+import sys
 from dataclasses import dataclass
+from datetime import date, datetime, time
 from pathlib import Path
-from typing import Dict, Generator, List, Optional
+from typing import Dict, Generator, List, Literal, Optional, Tuple, Union, overload
 
-try:
-    import openpyxl  # type: ignore
-except Exception:  # pragma: no cover
-    openpyxl = None
+from chat_engine.core._fast import dedupe_headers as _dedupe_headers
+from chat_engine.core._fast import safe_str as _safe_str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IngestStats:
     rows_seen: int
     rows_emitted: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IngestRow:
     """
     Raw row from input with provenance.
     data keys are the input headers exactly as read from file.
+    data values are stripped strings, never None.
     source_row is 1 based data row number excluding header.
     """
     data: Dict[str, str]
     source_row: int
 
 
-def _safe_str(v: object) -> str:
-    if v is None:
-        return ""
-    return str(v).strip()
+@dataclass(frozen=True, slots=True)
+class IngestRowTuple:
+    """
+    Raw row as a tuple of stripped values with provenance.
+    headers are the input headers in file order, the same tuple object for
+    every row of one file.
+    source_row is 1 based data row number excluding header.
+    """
+    values: Tuple[str, ...]
+    headers: Tuple[str, ...]
+    source_row: int
 
 
 def sniff_input_type(path: str | Path) -> str:
@@ -56,14 +64,46 @@ def sniff_input_type(path: str | Path) -> str:
     raise ValueError(f"Unsupported input type: {ext}")
 
 
+@overload
+def iter_csv_rows(
+    path: str | Path,
+    encoding: str = ...,
+    errors: str = ...,
+    as_tuple: Literal[False] = ...,
+) -> Generator[IngestRow, None, IngestStats]: ...
+
+
+@overload
+def iter_csv_rows(
+    path: str | Path,
+    encoding: str = ...,
+    errors: str = ...,
+    *,
+    as_tuple: Literal[True],
+) -> Generator[IngestRowTuple, None, IngestStats]: ...
+
+
+@overload
+def iter_csv_rows(
+    path: str | Path,
+    encoding: str = ...,
+    errors: str = ...,
+    as_tuple: bool = ...,
+) -> Generator[Union[IngestRow, IngestRowTuple], None, IngestStats]: ...
+
+
 def iter_csv_rows(
     path: str | Path,
     encoding: str = "utf-8",
     errors: str = "replace",
-) -> Generator[IngestRow, None, IngestStats]:
+    as_tuple: bool = False,
+) -> Generator[Union[IngestRow, IngestRowTuple], None, IngestStats]:
     """
     Streams a CSV and yields IngestRow.
 
+    With as_tuple=True yields IngestRowTuple instead, which skips building
+    a header keyed dict per row. normalize_row accepts either.
+
     Determinism:
     - header order is the order in the file
     - source_row is stable and 1 based for the first data row
@@ -73,17 +113,31 @@ def iter_csv_rows(
     rows_emitted = 0
 
     with p.open("r", encoding=encoding, errors=errors, newline="") as f:
-        reader = csv.DictReader(f)
-        if reader.fieldnames is None:
+        reader = csv.reader(f)
+        fieldnames = next(reader, None)
+        if fieldnames is None:
             return IngestStats(rows_seen=0, rows_emitted=0)
 
-        fieldnames = list(reader.fieldnames)
+        fieldnames = [sys.intern(k) for k in fieldnames]
+        width = len(fieldnames)
+        headers = tuple(fieldnames)
+        idx = 0
 
-        for idx, row in enumerate(reader, start=1):
+        for row in reader:
+            # Blank lines are skipped without consuming a source_row, as csv.DictReader did
+            if not row:
+                continue
+            idx += 1
             rows_seen += 1
-            cleaned: Dict[str, str] = {k: _safe_str(row.get(k)) for k in fieldnames}
+            if len(row) < width:
+                row += [""] * (width - len(row))
             rows_emitted += 1
-            yield IngestRow(data=cleaned, source_row=idx)
+            if as_tuple:
+                values = tuple([v.strip() for v in row[:width]])
+                yield IngestRowTuple(values=values, headers=headers, source_row=idx)
+            else:
+                cleaned: Dict[str, str] = {k: v.strip() for k, v in zip(fieldnames, row)}
+                yield IngestRow(data=cleaned, source_row=idx)
 
     return IngestStats(rows_seen=rows_seen, rows_emitted=rows_emitted)
 
@@ -99,11 +153,15 @@ def iter_xlsx_rows(
     - XLSX is supported for convenience
     - for very large exports CSV is recommended
     """
-    if openpyxl is None:
+    # Imported here so CSV only runs do not pay openpyxl's import cost
+    try:
+        import openpyxl  # type: ignore
+    except Exception:  # pragma: no cover
         raise RuntimeError("openpyxl is not available. Install it or convert XLSX to CSV before ingest.")
 
     p = Path(path)
-    wb = openpyxl.load_workbook(p, read_only=True, data_only=True)
+    # keep_links=False stops openpyxl loading cached copies of linked workbooks
+    wb = openpyxl.load_workbook(p, read_only=True, data_only=True, keep_vba=False, keep_links=False)
 
     try:
         ws = wb[sheet_name] if sheet_name else wb.active
@@ -135,19 +193,82 @@ def iter_xlsx_rows(
         wb.close()
 
 
-def _dedupe_headers(headers: List[str]) -> List[str]:
+def iter_xlsx_rows_fast(
+    path: str | Path,
+    sheet_name: Optional[str] = None,
+) -> Generator[IngestRow, None, IngestStats]:
+    """
+    Reads an XLSX using the Rust backed python-calamine reader and yields IngestRow.
+
+    Notes:
+    - opt in: calamine holds the sheet's cell range in memory, unlike the
+      openpyxl read_only stream iter_rows_auto uses
+    - rows, headers and source_row match iter_xlsx_rows
+    - falls back to iter_xlsx_rows when python-calamine is not installed
+    """
+    try:
+        import python_calamine  # type: ignore
+    except Exception:
+        return (yield from iter_xlsx_rows(path, sheet_name=sheet_name))
+
+    wb = python_calamine.CalamineWorkbook.from_path(str(path))
+
+    try:
+        ws = wb.get_sheet_by_name(sheet_name) if sheet_name else wb.get_sheet_by_index(0)
+        if ws.start is None:
+            return IngestStats(rows_seen=0, rows_emitted=0)
+
+        # calamine rows begin at sheet row 1 but at the first used column.
+        # openpyxl rows begin at column A, so pad to keep header positions equal.
+        lead: List[object] = [""] * ws.start[1]
+        rows_iter = ws.iter_rows()
+
+        try:
+            header_row = lead + list(next(rows_iter))
+        except StopIteration:
+            return IngestStats(rows_seen=0, rows_emitted=0)
+
+        headers = [_cell_str(h) for h in header_row]
+        if not any(headers):
+            return IngestStats(rows_seen=0, rows_emitted=0)
+
+        headers = _dedupe_headers(headers)
+        width = len(headers)
+
+        rows_seen = 0
+        rows_emitted = 0
+
+        for idx, values in enumerate(rows_iter, start=1):
+            rows_seen += 1
+            values = lead + list(values)
+            n = min(width, len(values))
+            data = {headers[i]: _cell_str(values[i]) for i in range(n)}
+            for i in range(n, width):
+                data[headers[i]] = ""
+            rows_emitted += 1
+            yield IngestRow(data=data, source_row=idx)
+
+        return IngestStats(rows_seen=rows_seen, rows_emitted=rows_emitted)
+    finally:
+        wb.close()
+
+
+def _cell_str(v: object) -> str:
     """
-    If an export has duplicate column names, suffix them deterministically.
-    Example: Message, Message becomes Message, Message_2
+    Renders a calamine cell the way openpyxl yields the same cell.
+
+    calamine reports every number as float, while openpyxl yields int for
+    values stored without a decimal point or exponent. A whole float whose
+    repr has no exponent is stored that way, so it is rendered as int.
+    calamine also reports date formatted cells at midnight as date, where
+    openpyxl yields datetime.
     """
-    seen: Dict[str, int] = {}
-    out: List[str] = []
-    for h in headers:
-        base = h if h else "COL"
-        count = seen.get(base, 0) + 1
-        seen[base] = count
-        out.append(base if count == 1 else f"{base}_{count}")
-    return out
+    if isinstance(v, float):
+        if v.is_integer() and "e" not in repr(v):
+            return str(int(v))
+    elif isinstance(v, date) and not isinstance(v, datetime):
+        v = datetime.combine(v, time())
+    return _safe_str(v)
 
 
 def iter_rows_auto(
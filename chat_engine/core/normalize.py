@@ -10,15 +10,17 @@ Purpose: Communication Heuristics Analysis for Triage (CHAT) engine for determin
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-from zoneinfo import ZoneInfo
+from chat_engine.core._fast import clean_party as _clean_party
+from chat_engine.core._fast import intern_short as _intern_short
+from chat_engine.core._fast import stable_key as _stable_key
+from chat_engine.core._fast import timestamp_to_utc_iso as _timestamp_to_utc_iso
+from chat_engine.core.ingest import IngestRow, IngestRowTuple
 
-from chat_engine.core.ingest import IngestRow
 
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SchemaMapping:
     """
     Maps tool export columns to CHAT normalized fields.
@@ -35,7 +37,23 @@ class SchemaMapping:
     thread_col: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class ResolvedMapping:
+    """
+    SchemaMapping resolved against one file's headers.
+    Each *_idx is the column position in IngestRowTuple.values, or None if
+    the column is not mapped or not present in the headers.
+    """
+    mapping: SchemaMapping
+    timestamp_idx: Optional[int]
+    from_idx: Optional[int]
+    to_idx: Optional[int]
+    message_idx: Optional[int]
+    uniqid_idx: Optional[int]
+    thread_idx: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
 class NormalizedMessage:
     """
     Stable internal record for the rest of the pipeline.
@@ -56,33 +74,257 @@ class NormalizedMessage:
 
 
 def normalize_row(
-    row: IngestRow,
-    mapping: SchemaMapping,
+    row: Union[IngestRow, IngestRowTuple],
+    mapping: Union[SchemaMapping, ResolvedMapping],
     assume_tz: str = "America/New_York",
 ) -> NormalizedMessage:
+    """
+    Accepts either a SchemaMapping or the ResolvedMapping returned by
+    resolve_mapping. Tuple rows are read by column position either way.
+    """
+    fields = _extract_fields(row, mapping)
+    ts_utc = parse_timestamp_to_utc_iso(fields[0], assume_tz=assume_tz)
+    return _make_message(row.source_row, fields, ts_utc)
+
+
+def compile_normalizer(
+    mapping: SchemaMapping,
+    assume_tz: str = "America/New_York",
+) -> Callable[[IngestRow], NormalizedMessage]:
+    """
+    Returns a normalize_row equivalent for IngestRow specialized to mapping.
+
+    Column names, assume_tz and whether thread and uniqid columns are mapped
+    are bound once as closure locals rather than read from the mapping on
+    every row.
+    """
+    ts_col = mapping.timestamp_col
+    from_col = mapping.from_col
+    to_col = mapping.to_col
+    message_col = mapping.message_col
+    thread_col = mapping.thread_col or ""
+    uniqid_col = mapping.uniqid_col or ""
+
+    clean_party = _clean_party
+    intern_short = _intern_short
+    parse_ts = parse_timestamp_to_utc_iso
+    make_message = _make_message
+
+    def normalize(row: IngestRow) -> NormalizedMessage:
+        data = row.data
+        ts_raw = data.get(ts_col, "")
+        fields = (
+            ts_raw,
+            clean_party(data.get(from_col, "")),
+            clean_party(data.get(to_col, "")),
+            data.get(message_col, ""),
+            intern_short(data.get(thread_col, "")) if thread_col else "",
+            data.get(uniqid_col, "") if uniqid_col else "",
+        )
+        return make_message(row.source_row, fields, parse_ts(ts_raw, assume_tz))
+
+    return normalize
+
+
+def normalize_rows_batch(
+    rows: Iterable[Union[IngestRow, IngestRowTuple]],
+    mapping: Union[SchemaMapping, ResolvedMapping],
+    assume_tz: str = "America/New_York",
+) -> List[NormalizedMessage]:
+    """
+    Normalizes many rows at once. Output is identical to normalize_row per row.
+
+    When pandas is installed, timestamps in the YYYY-MM-DD HH:MM:SS shape
+    are converted to UTC in one vectorized pass. Any other shape, and any
+    local time pandas reports as ambiguous or nonexistent, uses
+    parse_timestamp_to_utc_iso.
+    """
+    rows = list(rows)
+    fields = [_extract_fields(row, mapping) for row in rows]
+    ts_utc = _batch_timestamps_to_utc_iso([f[0] for f in fields], assume_tz)
+    return [_make_message(row.source_row, f, t) for row, f, t in zip(rows, fields, ts_utc)]
+
+
+def normalize_to_columns(
+    rows: Iterable[Union[IngestRow, IngestRowTuple]],
+    mapping: Union[SchemaMapping, ResolvedMapping],
+    assume_tz: str = "America/New_York",
+) -> Any:
+    """
+    Normalizes rows into a column oriented pyarrow Table.
+
+    Columns follow NormalizedMessage. ts_utc is timestamp[us, UTC] (null if
+    unparsed), source_row is int32 and text columns are large_string.
+    """
+    try:
+        import pyarrow as pa  # type: ignore
+    except Exception:
+        raise RuntimeError("pyarrow is not available. Install it or use normalize_row per row.")
+
+    msg_id: List[str] = []
+    source_row: List[int] = []
+    ts_raw: List[str] = []
+    ts_utc: List[Optional[str]] = []
+    sender: List[str] = []
+    recipient: List[str] = []
+    body: List[str] = []
+    thread_id: List[str] = []
+
+    # No NormalizedMessage per row: fields go straight into column lists and
+    # ts_utc stays an ISO string until Arrow converts the column in one cast
+    for row in rows:
+        fields = _extract_fields(row, mapping)
+        raw = fields[0]
+        msg_id.append(fields[5] or _generated_msg_id(row.source_row, fields))
+        source_row.append(row.source_row)
+        ts_raw.append(raw)
+        ts_utc.append(parse_timestamp_to_utc_iso(raw, assume_tz=assume_tz))
+        sender.append(fields[1])
+        recipient.append(fields[2])
+        body.append(fields[3])
+        thread_id.append(fields[4])
+
+    text = pa.large_string()
+    return pa.table(
+        {
+            "msg_id": pa.array(msg_id, type=text),
+            "source_row": pa.array(source_row, type=pa.int32()),
+            "ts_raw": pa.array(ts_raw, type=text),
+            "ts_utc": pa.array(ts_utc, type=text).cast(pa.timestamp("us", tz="UTC")),
+            "sender": pa.array(sender, type=text),
+            "recipient": pa.array(recipient, type=text),
+            "body": pa.array(body, type=text),
+            "thread_id": pa.array(thread_id, type=text),
+        }
+    )
+
+
+def _batch_timestamps_to_utc_iso(values: List[str], assume_tz: str) -> List[Optional[str]]:
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        return [parse_timestamp_to_utc_iso(v, assume_tz=assume_tz) for v in values]
+
+    unique = list(dict.fromkeys(values))
+    series = pd.Series(unique, dtype=object)
+    shaped = series.where(series.str.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", na=False))
+
+    parsed = pd.to_datetime(shaped, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    localized = parsed.dt.tz_localize(assume_tz, ambiguous="NaT", nonexistent="NaT")
+    converted = localized.dt.tz_convert("UTC").dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    by_raw: Dict[str, Optional[str]] = {}
+    for raw, iso in zip(unique, converted):
+        by_raw[raw] = iso if isinstance(iso, str) else parse_timestamp_to_utc_iso(raw, assume_tz=assume_tz)
+    return [by_raw[v] for v in values]
+
+
+@lru_cache(maxsize=32)
+def resolve_mapping(headers: Tuple[str, ...], mapping: SchemaMapping) -> ResolvedMapping:
+    """
+    Resolve mapping column names to positions in headers once per file.
+    For duplicate header names the last position wins, as with dict rows.
+    """
+    index: Dict[str, int] = {h: i for i, h in enumerate(headers)}
+
+    def pos(col: Optional[str]) -> Optional[int]:
+        return index.get(col) if col else None
+
+    return ResolvedMapping(
+        mapping=mapping,
+        timestamp_idx=pos(mapping.timestamp_col),
+        from_idx=pos(mapping.from_col),
+        to_idx=pos(mapping.to_col),
+        message_idx=pos(mapping.message_col),
+        uniqid_idx=pos(mapping.uniqid_col),
+        thread_idx=pos(mapping.thread_col),
+    )
+
+
+# ts_raw, sender, recipient, body, thread_id, msg_id
+_RowFields = Tuple[str, str, str, str, str, str]
+
+
+def _extract_fields(
+    row: Union[IngestRow, IngestRowTuple],
+    mapping: Union[SchemaMapping, ResolvedMapping],
+) -> _RowFields:
+    if isinstance(row, IngestRowTuple):
+        if isinstance(mapping, SchemaMapping):
+            mapping = _resolve_for_headers(row.headers, mapping)
+        return _tuple_row_fields(row, mapping)
+
+    if isinstance(mapping, ResolvedMapping):
+        mapping = mapping.mapping
+
+    # Ingest has already stripped every value
     data = row.data
 
-    ts_raw = (data.get(mapping.timestamp_col, "") or "").strip()
+    ts_raw = data.get(mapping.timestamp_col, "")
     sender = _clean_party(data.get(mapping.from_col, ""))
     recipient = _clean_party(data.get(mapping.to_col, ""))
-    body = (data.get(mapping.message_col, "") or "").strip()
+    body = data.get(mapping.message_col, "")
 
     thread_id = ""
     if mapping.thread_col:
-        thread_id = (data.get(mapping.thread_col, "") or "").strip()
+        thread_id = _intern_short(data.get(mapping.thread_col, ""))
 
     msg_id = ""
     if mapping.uniqid_col:
-        msg_id = (data.get(mapping.uniqid_col, "") or "").strip()
+        msg_id = data.get(mapping.uniqid_col, "")
 
-    if not msg_id:
-        msg_id = f"ROW{row.source_row}:{_stable_key(ts_raw, sender, recipient)}"
+    return ts_raw, sender, recipient, body, thread_id, msg_id
+
+
+# (headers, mapping, resolved) from the previous tuple row. Rows of one file
+# share the same headers object, so an identity check skips rehashing the
+# headers tuple and mapping in resolve_mapping on every row.
+_last_resolved: Optional[Tuple[Tuple[str, ...], SchemaMapping, ResolvedMapping]] = None
 
-    ts_utc = parse_timestamp_to_utc_iso(ts_raw, assume_tz=assume_tz)
+
+def _resolve_for_headers(headers: Tuple[str, ...], mapping: SchemaMapping) -> ResolvedMapping:
+    global _last_resolved
+    last = _last_resolved
+    if last is not None and last[0] is headers and last[1] is mapping:
+        return last[2]
+    resolved = resolve_mapping(headers, mapping)
+    _last_resolved = (headers, mapping, resolved)
+    return resolved
+
+
+def _tuple_row_fields(row: IngestRowTuple, resolved: ResolvedMapping) -> _RowFields:
+    values = row.values
+
+    # Inlined rather than a helper call per column; this runs for every row
+    i = resolved.timestamp_idx
+    ts_raw = values[i] if i is not None else ""
+    i = resolved.from_idx
+    sender = _clean_party(values[i] if i is not None else "")
+    i = resolved.to_idx
+    recipient = _clean_party(values[i] if i is not None else "")
+    i = resolved.message_idx
+    body = values[i] if i is not None else ""
+    i = resolved.thread_idx
+    thread_id = _intern_short(values[i]) if i is not None else ""
+    i = resolved.uniqid_idx
+    msg_id = values[i] if i is not None else ""
+
+    return ts_raw, sender, recipient, body, thread_id, msg_id
+
+
+def _generated_msg_id(source_row: int, fields: _RowFields) -> str:
+    return f"ROW{source_row}:{_stable_key(fields[0], fields[1], fields[2])}"
+
+
+def _make_message(source_row: int, fields: _RowFields, ts_utc: Optional[str]) -> NormalizedMessage:
+    ts_raw, sender, recipient, body, thread_id, msg_id = fields
+
+    if not msg_id:
+        msg_id = _generated_msg_id(source_row, fields)
 
     return NormalizedMessage(
         msg_id=msg_id,
-        source_row=row.source_row,
+        source_row=source_row,
         ts_raw=ts_raw,
         ts_utc=ts_utc,
         sender=sender,
@@ -103,69 +345,20 @@ def parse_timestamp_to_utc_iso(
     - If timezone present, convert to UTC
     - If naive, assume assume_tz then convert to UTC
     - Returns UTC ISO string ending in Z, or None
+
+    Results are memoized on (ts_raw, assume_tz) since exports repeat the
+    same timestamp strings heavily. The cache is safe to share across
+    threads. Use parse_timestamp_to_utc_iso.cache_clear() to reset it.
     """
     s = (ts_raw or "").strip()
     if not s:
         return None
+    return _parse_ts_cached(s, assume_tz)
 
-    dt = _try_fromiso(s)
-    if dt is None:
-        for fmt in (
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%d %H:%M",
-            "%m/%d/%Y %H:%M:%S",
-            "%m/%d/%Y %H:%M",
-            "%m/%d/%y %H:%M:%S",
-            "%m/%d/%y %H:%M",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S.%f",
-        ):
-            dt = _try_strptime(s, fmt)
-            if dt is not None:
-                break
-
-    if dt is None:
-        return None
-
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=ZoneInfo(assume_tz))
-
-    dt_utc = dt.astimezone(timezone.utc)
-    return dt_utc.isoformat().replace("+00:00", "Z")
 
+@lru_cache(maxsize=131072)
+def _parse_ts_cached(s: str, assume_tz: str) -> Optional[str]:
+    return _timestamp_to_utc_iso(s, assume_tz)
 
-def _clean_party(v: str) -> str:
-    s = (v or "").strip()
-    return " ".join(s.split())
 
-
-def _stable_key(ts_raw: str, sender: str, recipient: str) -> str:
-    base = f"{ts_raw}|{sender}|{recipient}"
-    return str(_fnv1a_32(base))
-
-
-def _fnv1a_32(text: str) -> int:
-    """
-    Deterministic 32 bit FNV 1a hash.
-    """
-    h = 2166136261
-    for b in text.encode("utf-8", errors="replace"):
-        h ^= b
-        h = (h * 16777619) & 0xFFFFFFFF
-    return h
-
-
-def _try_fromiso(s: str) -> Optional[datetime]:
-    try:
-        if s.endswith("Z"):
-            s = s[:-1] + "+00:00"
-        return datetime.fromisoformat(s)
-    except Exception:
-        return None
-
-
-def _try_strptime(s: str, fmt: str) -> Optional[datetime]:
-    try:
-        return datetime.strptime(s, fmt)
-    except Exception:
-        return None
\ No newline at end of file
+parse_timestamp_to_utc_iso.cache_clear = _parse_ts_cached.cache_clear  # type: ignore[attr-defined]
@@ -7,11 +7,15 @@ Date: 2026-02-21
 Purpose: Communication Heuristics Analysis for Triage (CHAT) engine for deterministic prioritization of exported communications.
 """
 
+import importlib.util
 import os
+import sys
 import tempfile
 import unittest
+from datetime import datetime
+from unittest import mock
 
-from chat_engine.core.ingest import iter_csv_rows
+from chat_engine.core.ingest import iter_csv_rows, iter_xlsx_rows, iter_xlsx_rows_fast
 
 
 class TestIngestCSV(unittest.TestCase):
@@ -35,6 +39,78 @@ class TestIngestCSV(unittest.TestCase):
             self.assertEqual(rows[0].data["message"], "Hello")
             self.assertEqual(rows[1].data["uniqid"], "2")
 
+    def test_iter_csv_rows_as_tuple_shares_headers(self) -> None:
+        csv_text = (
+            "timestamp,from,to,message,uniqid\n"
+            "2026-02-21 10:00:00,Alice,Bob, Hello ,1\n"
+            "2026-02-21 10:01:00,Bob,Alice\n"
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.csv")
+            with open(p, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+
+            rows = list(iter_csv_rows(p, as_tuple=True))
+
+            self.assertEqual(len(rows), 2)
+            self.assertIs(rows[0].headers, rows[1].headers)
+            self.assertEqual(rows[0].values[rows[0].headers.index("message")], "Hello")
+            self.assertEqual(rows[1].values, ("2026-02-21 10:01:00", "Bob", "Alice", "", ""))
+            self.assertEqual(rows[1].source_row, 2)
+
+
+def _write_sample_xlsx(path: str) -> None:
+    import openpyxl  # type: ignore
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    # Column A is left empty so readers must keep header positions aligned
+    ws["B1"], ws["C1"], ws["D1"] = "timestamp", "from", "message"
+    ws["B2"], ws["C2"], ws["D2"] = "2026-02-21 10:00:00", "Alice", 42
+    ws["B3"], ws["C3"], ws["D3"] = "2026-02-21 10:01:00", " Bob ", 2.5
+    ws["E4"] = "stray"
+    ws["B5"], ws["C5"], ws["D5"] = datetime(2026, 2, 21), 2.0, 1e20
+    ws["B5"].number_format = "yyyy-mm-dd"
+    wb.save(path)
+
+
+@unittest.skipUnless(importlib.util.find_spec("openpyxl"), "openpyxl not installed")
+class TestIngestXLSX(unittest.TestCase):
+    def test_iter_xlsx_rows_reads_sheet(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.xlsx")
+            _write_sample_xlsx(p)
+
+            rows = list(iter_xlsx_rows(p))
+
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(rows[0].data["message"], "42")
+            self.assertEqual(rows[1].data["from"], "Bob")
+            self.assertEqual(rows[2].data["COL_2"], "stray")
+            self.assertEqual(rows[2].source_row, 3)
+            self.assertEqual(rows[3].data["timestamp"], "2026-02-21 00:00:00")
+            self.assertEqual(rows[3].data["from"], "2")
+            self.assertEqual(rows[3].data["message"], "1e+20")
+
+    def test_iter_xlsx_rows_fast_falls_back_to_openpyxl(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.xlsx")
+            _write_sample_xlsx(p)
+
+            with mock.patch.dict(sys.modules, {"python_calamine": None}):
+                rows = list(iter_xlsx_rows_fast(p))
+
+            self.assertEqual(rows, list(iter_xlsx_rows(p)))
+
+    @unittest.skipUnless(importlib.util.find_spec("python_calamine"), "python-calamine not installed")
+    def test_iter_xlsx_rows_fast_matches_openpyxl(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.xlsx")
+            _write_sample_xlsx(p)
+
+            self.assertEqual(list(iter_xlsx_rows_fast(p)), list(iter_xlsx_rows(p)))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
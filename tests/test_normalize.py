@@ -7,12 +7,23 @@ Date: 2026-02-21
 Purpose: Communication Heuristics Analysis for Triage (CHAT) engine for deterministic prioritization of exported communications.
 """
 
+import importlib.util
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 from chat_engine.core.ingest import iter_csv_rows
-from chat_engine.core.normalize import SchemaMapping, normalize_row
+from chat_engine.core.normalize import (
+    SchemaMapping,
+    compile_normalizer,
+    normalize_row,
+    normalize_rows_batch,
+    normalize_to_columns,
+    parse_timestamp_to_utc_iso,
+    resolve_mapping,
+)
+from chat_engine.core.normalize import _clean_party
 
 
 class TestNormalize(unittest.TestCase):
@@ -70,6 +81,232 @@ class TestNormalize(unittest.TestCase):
             self.assertIsNotNone(nm.ts_utc)
             self.assertTrue(nm.ts_utc.endswith("Z"))
 
+    def test_tuple_rows_normalize_like_dict_rows(self) -> None:
+        csv_text = (
+            "timestamp,from,to,message,thread\n"
+            "2026-02-21 10:00:00,Alice  Smith,Bob,Hello,t1\n"
+        )
+
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+            thread_col="thread",
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.csv")
+            with open(p, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+
+            dict_row = list(iter_csv_rows(p))[0]
+            tuple_row = list(iter_csv_rows(p, as_tuple=True))[0]
+
+            self.assertEqual(normalize_row(tuple_row, mapping), normalize_row(dict_row, mapping))
+            self.assertEqual(compile_normalizer(mapping)(dict_row), normalize_row(dict_row, mapping))
+            self.assertEqual(normalize_row(tuple_row, mapping).sender, "Alice Smith")
+
+            # Repeated party and thread values share one object across rows
+            other = list(iter_csv_rows(p))[0]
+            self.assertIs(normalize_row(other, mapping).thread_id, normalize_row(dict_row, mapping).thread_id)
+            self.assertIs(normalize_row(other, mapping).recipient, normalize_row(tuple_row, mapping).recipient)
+
+    def test_normalize_rows_batch_matches_normalize_row(self) -> None:
+        csv_text = (
+            "timestamp,from,to,message\n"
+            "2026-02-21 10:00:00,Alice,Bob,Hello\n"
+            "02/21/2026 10:01,Bob,Alice,Hi\n"
+            "2026-11-01 01:30:00,Alice,Bob,Ambiguous\n"
+            "not a time,Bob,Alice,Bad\n"
+            "2026-02-21 10:00:00,Carol,Bob,Repeat\n"
+        )
+
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.csv")
+            with open(p, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+
+            rows = list(iter_csv_rows(p))
+            batch = normalize_rows_batch(rows, mapping)
+
+            self.assertEqual(batch, [normalize_row(r, mapping) for r in rows])
+            self.assertIsNone(batch[3].ts_utc)
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas"), "pandas not installed")
+    def test_normalize_rows_batch_uses_pandas_for_plain_shape(self) -> None:
+        csv_text = (
+            "timestamp,from,to,message\n"
+            "2026-02-21 10:00:00,Alice,Bob,Hello\n"
+            "2026-02-21 10:05:00,Bob,Alice,Hi\n"
+            "02/21/2026 10:01,Bob,Alice,Slash\n"
+            "2026-11-01 01:30:00,Alice,Bob,Ambiguous\n"
+            "2026-03-08 02:30:00,Bob,Alice,Nonexistent\n"
+            "2026-02-21 10:00:00,Carol,Bob,Repeat\n"
+        )
+
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.csv")
+            with open(p, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+
+            rows = list(iter_csv_rows(p))
+            expected = [normalize_row(r, mapping) for r in rows]
+
+            with mock.patch(
+                "chat_engine.core.normalize.parse_timestamp_to_utc_iso",
+                wraps=parse_timestamp_to_utc_iso,
+            ) as scalar:
+                batch = normalize_rows_batch(rows, mapping)
+
+            self.assertEqual(batch, expected)
+            # Only shapes pandas skips and local times it reports as ambiguous
+            # or nonexistent reach the scalar parser
+            self.assertEqual(
+                [c.args[0] for c in scalar.call_args_list],
+                ["02/21/2026 10:01", "2026-11-01 01:30:00", "2026-03-08 02:30:00"],
+            )
+            self.assertEqual(batch[3].ts_utc, "2026-11-01T05:30:00Z")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_normalize_to_columns_builds_arrow_table(self) -> None:
+        csv_text = (
+            "timestamp,from,to,message\n"
+            "2026-02-21 10:00:00,Alice,Bob,Hello\n"
+            "not a time,Bob,Alice,Hi\n"
+        )
+
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "msgs.csv")
+            with open(p, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+
+            table = normalize_to_columns(iter_csv_rows(p), mapping)
+
+            self.assertEqual(table.num_rows, 2)
+            self.assertEqual(table.column("sender").to_pylist(), ["Alice", "Bob"])
+            self.assertEqual(table.column("source_row").to_pylist(), [1, 2])
+            self.assertEqual(table.column("ts_utc").null_count, 1)
+
+            expected = [normalize_row(r, mapping) for r in iter_csv_rows(p)]
+            self.assertEqual(table.column("msg_id").to_pylist(), [nm.msg_id for nm in expected])
+            self.assertEqual(
+                table.column("ts_utc").to_pylist()[0].isoformat().replace("+00:00", "Z"),
+                expected[0].ts_utc,
+            )
+
+    def test_tuple_rows_from_files_with_different_column_order(self) -> None:
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+        )
+
+        with tempfile.TemporaryDirectory() as td:
+            p1 = os.path.join(td, "a.csv")
+            p2 = os.path.join(td, "b.csv")
+            with open(p1, "w", encoding="utf-8", newline="") as f:
+                f.write("timestamp,from,to,message\n2026-02-21 10:00:00,Alice,Bob,Hello\n")
+            with open(p2, "w", encoding="utf-8", newline="") as f:
+                f.write("message,to,from,timestamp\nHi,Alice,Bob,2026-02-21 10:01:00\n")
+
+            first = normalize_row(list(iter_csv_rows(p1, as_tuple=True))[0], mapping)
+            second = normalize_row(list(iter_csv_rows(p2, as_tuple=True))[0], mapping)
+
+            self.assertEqual((first.sender, first.body), ("Alice", "Hello"))
+            self.assertEqual((second.sender, second.body), ("Bob", "Hi"))
+
+    def test_resolve_mapping_returns_column_positions(self) -> None:
+        headers = ("id", "timestamp", "from", "to", "message")
+        mapping = SchemaMapping(
+            timestamp_col="timestamp",
+            from_col="from",
+            to_col="to",
+            message_col="message",
+            uniqid_col="id",
+            thread_col="thread",
+        )
+
+        resolved = resolve_mapping(headers, mapping)
+
+        self.assertIs(resolve_mapping(headers, mapping), resolved)
+        self.assertEqual(resolved.timestamp_idx, 1)
+        self.assertEqual(resolved.uniqid_idx, 0)
+        self.assertEqual(resolved.message_idx, 4)
+        self.assertIsNone(resolved.thread_idx)
+
+    def test_clean_party_collapses_all_whitespace(self) -> None:
+        self.assertEqual(_clean_party("Alice"), "Alice")
+        self.assertEqual(_clean_party("Alice Smith"), "Alice Smith")
+        self.assertEqual(_clean_party("Alice  Smith"), "Alice Smith")
+        self.assertEqual(_clean_party("Alice\tSmith"), "Alice Smith")
+        self.assertEqual(_clean_party("Alice\u00a0Smith"), "Alice Smith")
+
+    def test_timestamp_parse_is_cached_and_clearable(self) -> None:
+        parse_timestamp_to_utc_iso.cache_clear()
+
+        first = parse_timestamp_to_utc_iso("2026-02-21 10:00:00", assume_tz="America/New_York")
+        second = parse_timestamp_to_utc_iso(" 2026-02-21 10:00:00 ", assume_tz="America/New_York")
+
+        self.assertEqual(first, "2026-02-21T15:00:00Z")
+        self.assertEqual(first, second)
+        self.assertIsNone(parse_timestamp_to_utc_iso("   "))
+
+        parse_timestamp_to_utc_iso.cache_clear()
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-02-21 10:00:00"), first)
+
+    def test_timestamp_parses_slash_shapes(self) -> None:
+        self.assertEqual(parse_timestamp_to_utc_iso("02/21/2026 10:00:05"), "2026-02-21T15:00:05Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("2/1/26 9:05"), "2026-02-01T14:05:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("12/31/99 23:59"), "2000-01-01T04:59:00Z")
+        self.assertIsNone(parse_timestamp_to_utc_iso("13/01/2026 10:00"))
+
+    def test_timestamp_parses_space_padded_day(self) -> None:
+        self.assertEqual(parse_timestamp_to_utc_iso("02/ 1/2026 10:00"), "2026-02-01T15:00:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-2- 1 1:5"), "2026-02-01T06:05:00Z")
+        self.assertIsNone(parse_timestamp_to_utc_iso("02/ 12/2026 10:00"))
+
+    def test_timestamp_parses_iso_week_and_compact_dates(self) -> None:
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-W08-6"), "2026-02-21T05:00:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("2026W086"), "2026-02-21T05:00:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("20260221T100000"), "2026-02-21T15:00:00Z")
+        # datetime.fromisoformat has never accepted ordinal dates
+        self.assertIsNone(parse_timestamp_to_utc_iso("2026-052"))
+
+    def test_timestamp_z_suffix_means_utc(self) -> None:
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-02-21T10:00:00Z"), "2026-02-21T10:00:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-02-21T10:00:00.25Z"), "2026-02-21T10:00:00.250000Z")
+        # A date only value with Z is UTC midnight, not assume_tz midnight
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-02-21Z"), "2026-02-21T00:00:00Z")
+        # An explicit offset followed by Z is malformed
+        self.assertIsNone(parse_timestamp_to_utc_iso("2026-02-21T10:00:00+05:00Z"))
+
+    def test_timestamp_parses_lowercase_t_separator(self) -> None:
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-2-21t10:00:00"), "2026-02-21T15:00:00Z")
+        self.assertEqual(parse_timestamp_to_utc_iso("2026-02-21t7:00:00"), "2026-02-21T12:00:00Z")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file